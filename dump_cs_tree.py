@@ -2,7 +2,7 @@ import tree_sitter_c_sharp
 from tree_sitter import Language, Parser, Node
 
 
-def print_tree_node(node: Node, prefix: str = "", is_last: bool = False):
+def print_tree_node_line(node: Node, prefix: str):
     if prefix:
         print(prefix[:-1] + "-", end="")
     if node.grammar_name in [
@@ -24,14 +24,34 @@ def print_tree_node(node: Node, prefix: str = "", is_last: bool = False):
         print(f"{node.grammar_name}: '{node_text}'")
     else:
         print(node.grammar_name)
-    child_count = len(node.named_children)
-    for child_index in range(child_count):
-        child = node.named_children[child_index]
-        print_tree_node(
-            child,
-            ((prefix[:-2] + "  ") if is_last else (prefix)) + "| ",
-            child_index >= child_count - 1,
-        )
+
+
+def print_tree_node(node: Node):
+    # Per level: prefix of its children, count of named children left to print
+    cursor = node.walk()
+    levels: list[list] = []
+    while True:
+        current_node = cursor.node
+        assert current_node
+        if current_node.is_named:
+            if levels:
+                prefix = levels[-1][0]
+                levels[-1][1] -= 1
+                is_last = levels[-1][1] == 0
+            else:
+                prefix = ""
+                is_last = False
+            print_tree_node_line(current_node, prefix)
+
+            if current_node.named_child_count and cursor.goto_first_child():
+                child_prefix = ((prefix[:-2] + "  ") if is_last else prefix) + "| "
+                levels.append([child_prefix, current_node.named_child_count])
+                continue
+
+        while not cursor.goto_next_sibling():
+            if not levels or not cursor.goto_parent():
+                return
+            levels.pop()
 
 
 LANG_CSHARP = Language(tree_sitter_c_sharp.language())
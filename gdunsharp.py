@@ -1,7 +1,12 @@
 from __future__ import annotations
 import os
-import glob
+import sys
+import logging
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from typing import TypeVar
+from functools import lru_cache
 import tree_sitter_c_sharp
 from tree_sitter import Language, Parser, Node, Tree
 
@@ -10,12 +15,32 @@ from tree_sitter import Language, Parser, Node, Tree
 # ERR: type SummaryMode not found
 
 
+logger = logging.getLogger("gdunsharp")
+
+_decoded_texts: dict[bytes, str] = {}
+
+
+def decode_intern(text: bytes) -> str:
+    decoded = _decoded_texts.get(text)
+    if decoded is None:
+        decoded = sys.intern(text.decode())
+        _decoded_texts[text] = decoded
+    return decoded
+
+
 # https://stackoverflow.com/questions/1175208/
+@lru_cache(maxsize=None)
 def camel_to_snake(s: str) -> str:
     return "".join(["_" + c.lower() if c.isupper() else c for c in s]).lstrip("_")
 
 
-class NodeKind(Enum):
+def write_file(path: str, contents: str):
+    with open(path, "w") as out_file:
+        out_file.write(contents)
+
+
+# Members compare and hash as their grammar names
+class NodeKind(str, Enum):
     CLASS_DECLARATION = "class_declaration"
     IFACE_DECLARATION = "interface_declaration"
     STRUCT_DECLARATION = "struct_declaration"
@@ -51,13 +76,61 @@ class NodeKind(Enum):
     MODIFIER = "modifier"
 
 
+LANG_CSHARP = Language(tree_sitter_c_sharp.language())
+
+T = TypeVar("T")
+
+
+# Some kinds are backed by several same-named grammar symbols
+_node_kind_ids_by_name: dict[str, set[int]] = {}
+for _node_kind_id in range(LANG_CSHARP.node_kind_count):
+    if LANG_CSHARP.node_kind_is_named(_node_kind_id):
+        _node_kind_name = LANG_CSHARP.node_kind_for_id(_node_kind_id)
+        assert _node_kind_name
+        _node_kind_ids_by_name.setdefault(_node_kind_name, set()).add(_node_kind_id)
+
+
+def get_node_kind_ids(node_kind: NodeKind) -> frozenset[int]:
+    node_kind_ids = _node_kind_ids_by_name.get(node_kind.value)
+    assert node_kind_ids
+    return frozenset(node_kind_ids)
+
+
+def index_by_node_kind_ids(values_by_node_kind: dict[NodeKind, T]) -> dict[int, T]:
+    return {
+        node_kind_id: value
+        for node_kind, value in values_by_node_kind.items()
+        for node_kind_id in get_node_kind_ids(node_kind)
+    }
+
+
+def get_field_id(field_name: str) -> int:
+    field_id = LANG_CSHARP.field_id_for_name(field_name)
+    assert field_id is not None
+    return field_id
+
+
+FIELD_NAME = get_field_id("name")
+FIELD_BODY = get_field_id("body")
+FIELD_TYPE = get_field_id("type")
+FIELD_RANK = get_field_id("rank")
+FIELD_VALUE = get_field_id("value")
+
+
+VARIABLE_DECLARATION_IDS = get_node_kind_ids(NodeKind.VARIABLE_DECLARATION)
+
+
 class CodeIdentifier:
+    __slots__ = ("id", "name")
+
     def __init__(self, name: str, id: str = ""):
         self.id = id if id else name
         self.name = name
 
 
 class CodeType(CodeIdentifier):
+    __slots__ = ("parent_type_scope",)
+
     def __init__(self, name: str, id: str, parent_type_scope: CodeTypeScope):
         super().__init__(name, id)
         self.parent_type_scope = parent_type_scope
@@ -75,10 +148,9 @@ class CodeType(CodeIdentifier):
     def get_header_contents(self) -> str:
         raise NotImplementedError("CodeType.get_header_contents()")
 
-    def emit_cpp(self, path: str):
+    def iter_cpp_files(self, path: str) -> Iterator[tuple[str, str]]:
         if self.is_emmittable():
-            with open(f"{path}/{camel_to_snake(self.name)}.hpp", "w") as out_file:
-                out_file.write(self.get_header_contents())
+            yield f"{path}/{camel_to_snake(self.name)}.hpp", self.get_header_contents()
 
     def get_include_path(self) -> str:
         assert isinstance(self.parent_type_scope, CodeNamespace)
@@ -86,18 +158,37 @@ class CodeType(CodeIdentifier):
 
 
 class CodeTypeScope:
-    def __init__(self: CodeTypeScope, parent: CodeTypeScope | None):
-        self.types_by_id: dict[str, CodeType] = {}
+    # Concrete scopes have these in their own __slots__
+    __slots__ = ()
+
+    types_by_id: dict[str, CodeType]
+    parent: CodeTypeScope | None
+
+
+class CodeGenericScope(CodeTypeScope):
+    __slots__ = ("types_by_id", "parent")
+
+    def __init__(self, parent: CodeTypeScope | None):
+        self.types_by_id = {}
         self.parent = parent
 
 
+def get_dummy_owner_scope(scope: CodeTypeScope | None) -> CodeTypeScope | None:
+    # Generic method scopes are per method, placeholders are shared per class
+    if isinstance(scope, CodeGenericScope):
+        return scope.parent
+    return scope
+
+
 class CodeNullableType(CodeType):
+    __slots__ = ("base_type",)
+
     def __init__(self, base_type):
         super().__init__(
             base_type.name + "?", base_type.id + "?", base_type.parent_type_scope
         )
         self.base_type = base_type
-        # print(f"Found nullable type {self.name}")
+        logger.debug("Found nullable type %s", self.name)
 
     def is_dummy(self) -> bool:
         return False
@@ -107,6 +198,8 @@ class CodeNullableType(CodeType):
 
 
 class DummyType(CodeType):
+    __slots__ = ()
+
     def __init__(self, name: str, parent_type_scope: CodeTypeScope):
         super().__init__(name=name, id=name, parent_type_scope=parent_type_scope)
 
@@ -115,6 +208,8 @@ class DummyType(CodeType):
 
 
 class CodeParam(CodeIdentifier):
+    __slots__ = ("type", "default_value")
+
     def __init__(self, name: str, type: CodeType, default_value: str | None):
         super().__init__(name)
         self.type = type
@@ -134,12 +229,24 @@ class CodeAccessorKind(Enum):
 
 
 class CodeAutoAccessorMethod:
+    __slots__ = ("kind", "field")
+
     def __init__(self, kind: CodeAccessorKind, field: CodeField | None):
         self.kind = kind
         self.field = field
 
 
 class CodeMethod(CodeIdentifier, CodeTypeScope):
+    __slots__ = (
+        "types_by_id",
+        "parent",
+        "return_type",
+        "is_extension",
+        "virtual_kind",
+        "params",
+        "body_source",
+    )
+
     def __init__(
         self,
         name: str,
@@ -154,7 +261,8 @@ class CodeMethod(CodeIdentifier, CodeTypeScope):
             id += f"`{len(generic_params)}"
 
         CodeIdentifier.__init__(self, name, id)
-        CodeTypeScope.__init__(self, parent_class)
+        self.types_by_id = {}
+        self.parent = parent_class
 
         self.return_type = return_type
         self.is_extension = False
@@ -193,6 +301,8 @@ class CodeMethod(CodeIdentifier, CodeTypeScope):
 
 
 class CodeField(CodeIdentifier):
+    __slots__ = ("type",)
+
     def __init__(self, name: str, type: CodeType):
         super().__init__(name)
         self.type = type
@@ -202,6 +312,8 @@ class CodeField(CodeIdentifier):
 
 
 class CodeProperty(CodeIdentifier):
+    __slots__ = ("type", "setter", "getter")
+
     def __init__(
         self,
         name: str,
@@ -222,6 +334,8 @@ class CodeClassKind(Enum):
 
 
 class CodeClassSpecialized(CodeType):
+    __slots__ = ("generic_class", "type_params")
+
     def __init__(self, generic_class: CodeClass, type_params: list[CodeType]):
         name = f"{generic_class.name}<{', '.join(t.name for t in type_params)}>"
         super().__init__(
@@ -231,7 +345,7 @@ class CodeClassSpecialized(CodeType):
         )
         self.generic_class = generic_class
         self.type_params = type_params
-        # print(f"Found generic class specialization: {self.name}")
+        logger.debug("Found generic class specialization: %s", self.name)
 
     def is_dummy(self):
         return self.generic_class.is_dummy()
@@ -241,6 +355,15 @@ class CodeClassSpecialized(CodeType):
 
 
 class ClassNodeContext:
+    __slots__ = (
+        "declaration_list_node",
+        "parent_namespace",
+        "using_strs",
+        "base_nodes",
+        "using_namespaces",
+        "search_namespaces",
+    )
+
     def __init__(
         self,
         declaration_list_node: Node,
@@ -252,9 +375,27 @@ class ClassNodeContext:
         self.parent_namespace = parent_namespace
         self.using_strs = using_strs
         self.base_nodes = base_nodes
+        self.using_namespaces: list[CodeNamespace] | None = None
+        self.search_namespaces: list[CodeNamespace] | None = None
+
+    def get_using_namespaces(self, codebase: Codebase) -> list[CodeNamespace]:
+        if self.using_namespaces is None:
+            self.using_namespaces = [
+                codebase.get_namespace(using) for using in self.using_strs
+            ]
+        return self.using_namespaces
+
+    def get_search_namespaces(self, codebase: Codebase) -> list[CodeNamespace]:
+        if self.search_namespaces is None:
+            self.search_namespaces = compute_search_namespaces(
+                self.parent_namespace, self.get_using_namespaces(codebase), codebase
+            )
+        return self.search_namespaces
 
 
 class CodeGenericParameter(CodeType):
+    __slots__ = ()
+
     def __init__(self, name: str, parent_scope: CodeTypeScope):
         super().__init__(name, name, parent_scope)
 
@@ -266,6 +407,21 @@ class CodeGenericParameter(CodeType):
 
 
 class CodeClass(CodeType, CodeTypeScope):
+    __slots__ = (
+        "types_by_id",
+        "parent",
+        "kind",
+        "is_dummy_type",
+        "ancestors",
+        "properties_by_id",
+        "fields_by_id",
+        "methods_by_id",
+        "usings",
+        "bases",
+        "contexts",
+        "specializations",
+    )
+
     @staticmethod
     def get_id(name: str, param_count: int) -> str:
         id = f"{name}`{param_count}" if param_count else name
@@ -277,13 +433,15 @@ class CodeClass(CodeType, CodeTypeScope):
         kind: CodeClassKind,
         generic_parameter_names: list[str],
         parent_namespace: CodeNamespace,
+        is_dummy_type: bool = False,
     ):
         id = CodeClass.get_id(name, len(generic_parameter_names))
         CodeType.__init__(self, name, id, parent_namespace)
-        CodeTypeScope.__init__(self, parent_namespace)
+        self.types_by_id = {}
+        self.parent = parent_namespace
 
         self.kind = kind
-        self.is_dummy_type = False
+        self.is_dummy_type = is_dummy_type
         self.ancestors: list[CodeClass] = []
         self.properties_by_id: dict[str, CodeProperty] = {}
         self.fields_by_id: dict[str, CodeField] = {}
@@ -294,6 +452,15 @@ class CodeClass(CodeType, CodeTypeScope):
             CodeGenericParameter(gn, self)
 
         self.contexts: list[ClassNodeContext] = []
+        self.specializations: dict[tuple[CodeType, ...], CodeClassSpecialized] = {}
+
+    def get_specialization(self, type_params: list[CodeType]) -> CodeClassSpecialized:
+        specialization_key = tuple(type_params)
+        specialization = self.specializations.get(specialization_key)
+        if specialization is None:
+            specialization = CodeClassSpecialized(self, type_params)
+            self.specializations[specialization_key] = specialization
+        return specialization
 
     def add_base_nodes(
         self,
@@ -333,64 +500,68 @@ class CodeClass(CodeType, CodeTypeScope):
     def get_header_contents(self) -> str:
         assert isinstance(self.parent_type_scope, CodeNamespace)
 
-        out = "#pragma once\n\n"
+        out = ["#pragma once\n\n"]
 
         parent_ns: CodeTypeScope | None = self.parent_type_scope
         while parent_ns:
             assert isinstance(parent_ns, CodeNamespace)
             if not parent_ns.name:
                 break
-            out += f"#include <{parent_ns.get_header_path()}>\n"
+            out.append(f"#include <{parent_ns.get_header_path()}>\n")
             parent_ns = parent_ns.parent
-        out += "\n"
+        out.append("\n")
 
         for using in self.usings:
-            out += f"#include <{using.get_header_path()}>\n"
-        out += "\n"
+            out.append(f"#include <{using.get_header_path()}>\n")
+        out.append("\n")
 
-        ns_name = self.parent_type_scope.get_full_path().replace(".", "::")
-        out += f"namespace {ns_name} {{\n\n"
+        ns_name = self.parent_type_scope.get_cpp_path()
+        out.append(f"namespace {ns_name} {{\n\n")
 
         for using in self.usings:
-            out += f"using namespace {using.get_full_path().replace('.','::')};\n"
-        out += "\n"
+            out.append(f"using namespace {using.get_cpp_path()};\n")
+        out.append("\n")
 
         template_decl = self.get_template_declaration()
         if template_decl:
             template_decl += "\n"
-        out += f"{template_decl}class {self.name}"
+        out.append(f"{template_decl}class {self.name}")
         if len(self.bases):
-            out += f": {', '.join([b.name for b in self.bases])} "
-        out += f"{{\n"
-        out += "public:\n"
+            out.append(f": {', '.join([b.name for b in self.bases])} ")
+        out.append("{\n")
+        out.append("public:\n")
 
         for field in self.fields_by_id.values():
-            out += f"\t{field.get_declaration()}\n"
-        out += "\n"
+            out.append(f"\t{field.get_declaration()}\n")
+        out.append("\n")
 
         for method in self.methods_by_id.values():
             declaration_lines = method.get_declaration().splitlines()
-            out += "".join([f"\t{ln}\n" for ln in declaration_lines])
-        out += "\n"
+            out.extend([f"\t{ln}\n" for ln in declaration_lines])
+        out.append("\n")
 
-        out += f"}};\n\n"
+        out.append("};\n\n")
 
         for method in self.methods_by_id.values():
             definition_lines = method.get_definition().splitlines()
-            out += "".join([f"{ln}\n" for ln in definition_lines])
-            out += "\n"
+            out.extend([f"{ln}\n" for ln in definition_lines])
+            out.append("\n")
 
-        out += f"}} // namespace {ns_name}\n"
-        return out
+        out.append(f"}} // namespace {ns_name}\n")
+        return "".join(out)
 
 
 class CodeEnumEntry(CodeIdentifier):
+    __slots__ = ("value",)
+
     def __init__(self, name: str, value: str | None):
         super().__init__(name)
         self.value = value
 
 
 class CodeEnum(CodeType):
+    __slots__ = ("entries",)
+
     def __init__(self, name: str, parent_namespace: CodeNamespace):
         super().__init__(name=name, id=name, parent_type_scope=parent_namespace)
         self.entries: list[CodeEnumEntry] = []
@@ -404,275 +575,367 @@ class CodeEnum(CodeType):
     def get_header_contents(self) -> str:
         assert isinstance(self.parent_type_scope, CodeNamespace)
 
-        out = "#pragma once\n\n"
-        ns_name = self.parent_type_scope.get_full_path().replace(".", "::")
-        out += f"namespace {ns_name} {{\n\n"
-        out += f"enum class {self.name} {{\n"
+        out = ["#pragma once\n\n"]
+        ns_name = self.parent_type_scope.get_cpp_path()
+        out.append(f"namespace {ns_name} {{\n\n")
+        out.append(f"enum class {self.name} {{\n")
 
         for entry in self.entries:
             value_str = f" = {entry.value}" if entry.value else ""
-            out += f"\t{entry.name}{value_str},\n"
+            out.append(f"\t{entry.name}{value_str},\n")
 
-        out += f"}};\n\n"
-        out += f"}} // namespace {ns_name}\n"
-        return out
+        out.append("};\n\n")
+        out.append(f"}} // namespace {ns_name}\n")
+        return "".join(out)
 
 
 class CodeNamespace(CodeIdentifier, CodeTypeScope):
+    __slots__ = (
+        "types_by_id",
+        "parent",
+        "subnamespaces",
+        "_full_path",
+        "_directory_path",
+        "_cpp_path",
+        "_header_path",
+    )
+
     def __init__(self, name: str, parent: CodeNamespace | None):
         CodeIdentifier.__init__(self, name)
-        CodeTypeScope.__init__(self, parent)
+        self.types_by_id = {}
+        self.parent = parent
         self.subnamespaces: dict[str, CodeNamespace] = {}
 
+        # Namespaces are never re-parented
+        if parent and parent.name:
+            self._full_path: str = f"{parent._full_path}.{name}"
+            self._directory_path: str = (
+                f"{parent._directory_path}/{camel_to_snake(name)}"
+            )
+            self._cpp_path: str = f"{parent._cpp_path}::{name}"
+        else:
+            self._full_path = name
+            self._directory_path = camel_to_snake(name)
+            self._cpp_path = name
+        self._header_path = f"{self._directory_path}/namespace.hpp"
+
         if parent:
             parent.subnamespaces[name] = self
 
     def get_full_path(self) -> str:
-        full_namespace = self.name
-        parent = self.parent
-        while parent:
-            assert isinstance(parent, CodeNamespace)
-            if not parent.name:
-                break
-            full_namespace = f"{parent.name}.{full_namespace}"
-            parent = parent.parent
-        return full_namespace
+        return self._full_path
+
+    def get_cpp_path(self) -> str:
+        return self._cpp_path
 
     def get_directory_path(self) -> str:
-        dir_path = camel_to_snake(self.name)
-        parent = self.parent
-        while parent:
-            assert isinstance(parent, CodeNamespace)
-            if not parent.name:
-                break
-            dir_path = f"{camel_to_snake(parent.name)}/{dir_path}"
-            parent = parent.parent
-        return dir_path
+        return self._directory_path
 
     def get_header_path(self) -> str:
-        return f"{self.get_directory_path()}/namespace.hpp"
+        return self._header_path
 
-    def get_all_types(self) -> list[CodeType]:
-        types = []
-        for type in self.types_by_id.values():
-            types.append(type)
-        for child_name in self.subnamespaces:
-            types += self.subnamespaces[child_name].get_all_types()
-        return types
-
-    def emit_cpp(self, path: str):
+    def iter_cpp_files(self, path: str) -> Iterator[tuple[str, str]]:
         os.makedirs(path, exist_ok=True)
-        with open(f"{path}/namespace.hpp", "w") as out_file:
-            out_file.write(self.get_namespace_header())
+        yield f"{path}/namespace.hpp", self.get_namespace_header()
         for subnamespace in self.subnamespaces.values():
-            subnamespace.emit_cpp(f"{path}/{camel_to_snake(subnamespace.name)}")
+            yield from subnamespace.iter_cpp_files(
+                f"{path}/{camel_to_snake(subnamespace.name)}"
+            )
 
         for type in self.types_by_id.values():
-            type.emit_cpp(f"{path}")
+            yield from type.iter_cpp_files(f"{path}")
 
     def get_namespace_header(self) -> str:
-        out = "#pragma once\n\n"
+        out = ["#pragma once\n\n"]
 
-        ns_name = self.get_full_path().replace(".", "::")
-        out += f"namespace {ns_name} {{\n\n"
+        ns_name = self.get_cpp_path()
+        out.append(f"namespace {ns_name} {{\n\n")
         for type in self.types_by_id.values():
             if type.is_emmittable():
-                out += f"{type.get_forward_declaration()}\n"
-        out += f"\n}} // namespace {ns_name}\n\n"
+                out.append(f"{type.get_forward_declaration()}\n")
+        out.append(f"\n}} // namespace {ns_name}\n\n")
 
         for type in self.types_by_id.values():
             if type.is_emmittable():
-                out += f"#include <{type.get_include_path()}>\n"
-        out += "\n"
-        return out
+                out.append(f"#include <{type.get_include_path()}>\n")
+        out.append("\n")
+        return "".join(out)
 
 
 class Codebase:
     def __init__(self):
         self.global_namespace = CodeNamespace(name="", parent=None)
-
-    def get_all_types(self) -> list[CodeType]:
-        return self.global_namespace.get_all_types()
+        self.type_lookups: dict[tuple[CodeNamespace, ...], dict[str, CodeType]] = {}
+        self.namespaces_by_path: dict[str, CodeNamespace] = {}
+        # Classes declared in the sources, in discovery order
+        self.classlikes: list[CodeClass] = []
+        # Placeholders for unresolved types, per class or namespace
+        self.dummy_types: dict[tuple[CodeTypeScope, str], DummyType] = {}
 
     def get_namespace(self, namespace_path: str) -> CodeNamespace:
         if namespace_path == "":
             return self.global_namespace
 
+        found_namespace = self.namespaces_by_path.get(namespace_path)
+        if found_namespace:
+            return found_namespace
+
         parts = namespace_path.split(".")
         ns = self.global_namespace
         for part in parts:
             ns = ns.subnamespaces[part]
+        self.namespaces_by_path[namespace_path] = ns
         return ns
 
+    def get_or_create_namespace(self, namespace_path: str) -> CodeNamespace:
+        found_namespace = self.namespaces_by_path.get(namespace_path)
+        if found_namespace:
+            return found_namespace
+
+        parent_namespace = self.global_namespace
+        for segment_name in namespace_path.split("."):
+            ns = parent_namespace.subnamespaces.get(segment_name)
+            if ns is None:
+                ns = CodeNamespace(segment_name, parent_namespace)
+            parent_namespace = ns
+        self.namespaces_by_path[namespace_path] = parent_namespace
+        return parent_namespace
+
+    def get_type_lookup(self, namespaces: list[CodeNamespace]) -> dict[str, CodeType]:
+        # Namespaces only get specializations and nullables past this point,
+        # which are never looked up by id
+        lookup_key = tuple(namespaces)
+        lookup = self.type_lookups.get(lookup_key)
+        if lookup is None:
+            lookup = {}
+            # Namespaces earlier in the search order take precedence
+            for namespace in reversed(namespaces):
+                lookup.update(namespace.types_by_id)
+            self.type_lookups[lookup_key] = lookup
+        return lookup
+
     def resolve_type(
         self,
         type_id: str,
         namespaces: list[CodeNamespace],
         parent_scope: CodeTypeScope | None,
     ) -> CodeType | None:
+        owner_scope = get_dummy_owner_scope(parent_scope)
         while parent_scope and len(parent_scope.types_by_id):
             if type_id in parent_scope.types_by_id:
                 return parent_scope.types_by_id[type_id]
             parent_scope = parent_scope.parent
 
-        for namespace in namespaces:
-            if type_id in namespace.types_by_id:
-                return namespace.types_by_id[type_id]
+        found_type = self.get_type_lookup(namespaces).get(type_id)
+        if found_type:
+            return found_type
 
-        print(f"ERR: type {type_id} not found")
+        if (owner_scope, type_id) not in self.dummy_types:
+            logger.error("type %s not found", type_id)
         return None
 
+    def get_dummy_type(self, type_id: str, parent_scope: CodeTypeScope) -> DummyType:
+        owner_scope = get_dummy_owner_scope(parent_scope)
+        assert owner_scope
+        dummy_key = (owner_scope, type_id)
+        dummy_type = self.dummy_types.get(dummy_key)
+        if dummy_type is None:
+            # Not in owner_scope, it could shadow class' generic params
+            dummy_type = DummyType(type_id, parent_scope)
+            self.dummy_types[dummy_key] = dummy_type
+        return dummy_type
+
     def emit_cpp(self, path: str):
-        self.global_namespace.emit_cpp(path)
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            write_futures = [
+                executor.submit(write_file, file_path, contents)
+                for file_path, contents in self.global_namespace.iter_cpp_files(path)
+            ]
+            for write_future in write_futures:
+                write_future.result()
+
+
+# Build outputs and package caches
+PRUNED_DIRECTORY_NAMES = {"bin", "obj", "node_modules"}
+
+
+def iter_cs_file_paths(root_path: str) -> Iterator[str]:
+    # Same order and hidden entry skipping as glob's "**/*.cs"
+    subdirectory_paths: list[str] = []
+    with os.scandir(root_path) as entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir():
+                if entry.name not in PRUNED_DIRECTORY_NAMES:
+                    subdirectory_paths.append(entry.path)
+            elif entry.name.endswith(".cs"):
+                yield entry.path
+    for subdirectory_path in subdirectory_paths:
+        yield from iter_cs_file_paths(subdirectory_path)
+
+
+def read_file_bytes(path: str) -> bytes:
+    with open(path, "rb") as source_file:
+        return source_file.read()
 
 
 def parse_files(root_path: str) -> dict[str, Tree]:
-    LANG_CSHARP = Language(tree_sitter_c_sharp.language())
     parser = Parser(LANG_CSHARP)
+    paths = list(iter_cs_file_paths(root_path))
 
-    paths = glob.glob(f"{root_path}/**/*.cs", recursive=True)
+    # Parsing holds the GIL, reads don't, so they go ahead in the background
     trees_by_path: dict[str, Tree] = {}
-    for path in paths:
-        file_bytes = open(path).read().encode()
-        tree = parser.parse(file_bytes)
-        trees_by_path[path] = tree
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for path, file_bytes in zip(paths, executor.map(read_file_bytes, paths)):
+            trees_by_path[path] = parser.parse(file_bytes)
     return trees_by_path
 
 
-def find_node_by_grammar_name(node: Node, grammar_name: str) -> Node | None:
-    if node.grammar_name == grammar_name:
-        return node
-    found_node: Node | None = None
-    for child in node.named_children:
-        found_node = find_node_by_grammar_name(child, grammar_name)
-        if found_node:
-            break
-    return found_node
+def iter_named_children(node: Node) -> Iterator[Node]:
+    cursor = node.walk()
+    has_child = cursor.goto_first_child()
+    while has_child:
+        child = cursor.node
+        assert child
+        if child.is_named:
+            yield child
+        has_child = cursor.goto_next_sibling()
+
+
+def find_child_by_grammar_ids(node: Node, grammar_ids: frozenset[int]) -> Node | None:
+    # For children the grammar doesn't expose as fields
+    for child in iter_named_children(node):
+        if child.grammar_id in grammar_ids:
+            return child
+    return None
+
+
+USING_NAME_NODE_KINDS = frozenset([NodeKind.QUALIFIED_NAME, NodeKind.IDENTIFIER])
 
 
 def get_using_from_node(node: Node) -> str:
-    assert node.named_children[0].grammar_name in [
-        NodeKind.QUALIFIED_NAME.value,
-        NodeKind.IDENTIFIER.value,
-    ]
-    assert node.named_children[0].text
+    name_node = node.named_child(0)
+    assert name_node
+    assert name_node.grammar_name in USING_NAME_NODE_KINDS
+    assert name_node.text
 
-    return node.named_children[0].text.decode()
+    return decode_intern(name_node.text)
 
 
 def get_or_create_namespace_from_node(node: Node, codebase: Codebase) -> CodeNamespace:
-    first_child = node.named_children[0]
-    assert first_child.grammar_name == NodeKind.QUALIFIED_NAME.value
+    first_child = node.named_child(0)
+    assert first_child and first_child.grammar_name == NodeKind.QUALIFIED_NAME
     assert first_child.text
-    namespace_chain = first_child.text.decode().split(".")
-    parent_namespace = codebase.global_namespace
-    for segment_name in namespace_chain:
-        if segment_name not in parent_namespace.subnamespaces:
-            ns = CodeNamespace(segment_name, parent_namespace)
-            parent_namespace = ns
-        else:
-            parent_namespace = parent_namespace.subnamespaces[segment_name]
-    return parent_namespace
+    return codebase.get_or_create_namespace(decode_intern(first_child.text))
 
 
 def get_type_parameter_names_from_node(node: Node) -> list[str]:
     param_names: list[str] = []
-    for child in node.named_children:
-        if child.grammar_name == NodeKind.TYPE_PARAM.value:
-            assert child.named_children[0]
-            identifier_node = child.named_children[0]
-            assert identifier_node.grammar_name == NodeKind.IDENTIFIER.value
+    for child in iter_named_children(node):
+        if child.grammar_name == NodeKind.TYPE_PARAM:
+            identifier_node = child.child_by_field_id(FIELD_NAME)
+            assert (
+                identifier_node and identifier_node.grammar_name == NodeKind.IDENTIFIER
+            )
             assert identifier_node.text
-            param_names.append(identifier_node.text.decode())
+            param_names.append(decode_intern(identifier_node.text))
 
     return param_names
 
 
+CLASS_KINDS = index_by_node_kind_ids(
+    {
+        NodeKind.CLASS_DECLARATION: CodeClassKind.CLASS,
+        NodeKind.IFACE_DECLARATION: CodeClassKind.INTERFACE,
+        NodeKind.STRUCT_DECLARATION: CodeClassKind.STRUCT,
+    }
+)
+
+
 def get_or_create_class_from_node(
-    node: Node, namespace: CodeNamespace, usings: list[str]
+    node: Node, codebase: Codebase, namespace: CodeNamespace, usings: list[str]
 ):
-    match node.grammar_name:
-        case NodeKind.CLASS_DECLARATION.value:
-            kind = CodeClassKind.CLASS
-        case NodeKind.IFACE_DECLARATION.value:
-            kind = CodeClassKind.INTERFACE
-        case NodeKind.STRUCT_DECLARATION.value:
-            kind = CodeClassKind.STRUCT
+    kind = CLASS_KINDS[node.grammar_id]
 
+    name_node = node.child_by_field_id(FIELD_NAME)
+    assert name_node and name_node.grammar_name == NodeKind.IDENTIFIER
+    assert name_node.text
+    class_name = decode_intern(name_node.text)
+
+    # Base and type parameter lists aren't exposed as fields by the grammar
     param_names: list[str] = []
     base_nodes: list[Node] = []
-    was_identifier = False
-    for child in node.named_children:
-        if child.grammar_name == NodeKind.IDENTIFIER.value:
-            assert not was_identifier
-            assert child.text
-            class_name = child.text.decode()
-            was_identifier = True
-        elif child.grammar_name == NodeKind.BASE_LIST.value:
-            for base_node in child.named_children:
-                base_nodes.append(base_node)
-        elif child.grammar_name == NodeKind.TYPE_PARAM_LIST.value:
+    for child in iter_named_children(node):
+        child_grammar_name = child.grammar_name
+        if child_grammar_name == NodeKind.BASE_LIST:
+            base_nodes.extend(iter_named_children(child))
+        elif child_grammar_name == NodeKind.TYPE_PARAM_LIST:
             param_names = get_type_parameter_names_from_node(child)
 
     class_id = class_name
     if len(param_names):
         class_id += f"`{len(param_names)}"
 
-    assert class_name
-    if class_id not in namespace.types_by_id:
+    found_type = namespace.types_by_id.get(class_id)
+    if found_type is None:
         code_class = CodeClass(class_name, kind, param_names, namespace)
-        # print(
-        #     f"Found {kind.name.lower()} {class_name} in namespace {namespace.get_full_path()}"
-        # )
+        codebase.classlikes.append(code_class)
+        logger.debug(
+            "Found %s %s in namespace %s",
+            kind.name.lower(),
+            class_name,
+            namespace.get_full_path(),
+        )
     else:
         # Might be partial and found somewhere else
-        found_type = namespace.types_by_id[class_id]
         assert isinstance(found_type, CodeClass)
         code_class = found_type
 
-    declaration_list_node = find_node_by_grammar_name(
-        node, NodeKind.DECLARATION_LIST.value
-    )
+    declaration_list_node = node.child_by_field_id(FIELD_BODY)
     assert declaration_list_node
+    assert declaration_list_node.grammar_name == NodeKind.DECLARATION_LIST
     code_class.contexts.append(
         ClassNodeContext(declaration_list_node, namespace, usings, base_nodes)
     )
 
 
 def parse_enum_declaration_list(enum: CodeEnum, declaration_list_node: Node):
-    for member_declaration in declaration_list_node.named_children:
-        assert member_declaration.grammar_name == NodeKind.ENUM_MEMBER_DECLARATION.value
-        name_node = member_declaration.named_children[0]
-        assert name_node.grammar_name == NodeKind.IDENTIFIER.value
+    for member_declaration in iter_named_children(declaration_list_node):
+        assert member_declaration.grammar_name == NodeKind.ENUM_MEMBER_DECLARATION
+        name_node = member_declaration.child_by_field_id(FIELD_NAME)
+        assert name_node and name_node.grammar_name == NodeKind.IDENTIFIER
         assert name_node.text
         value_text: str | None = None
-        if len(member_declaration.named_children) > 1:
-            value_node = member_declaration.named_children[1]
+        value_node = member_declaration.child_by_field_id(FIELD_VALUE)
+        if value_node:
             assert value_node.text
             value_text = value_node.text.decode()
-        enum.entries.append(CodeEnumEntry(name_node.text.decode(), value_text))
+        enum.entries.append(CodeEnumEntry(decode_intern(name_node.text), value_text))
 
 
 def get_or_create_enum_from_node(node: Node, namespace: CodeNamespace) -> CodeEnum:
-    assert node.grammar_name == NodeKind.ENUM_DECLARATION.value
-    enum_name: str | None = None
-    declaration_list_node: Node | None = None
-    for child in node.named_children:
-        if child.grammar_name == NodeKind.IDENTIFIER.value:
-            assert child.text
-            if not enum_name:
-                enum_name = child.text.decode()
-        elif child.grammar_name == NodeKind.ENUM_DECLARATION_LIST.value:
-            declaration_list_node = child
-
-    assert enum_name
-    if enum_name not in namespace.types_by_id:
+    assert node.grammar_name == NodeKind.ENUM_DECLARATION
+    name_node = node.child_by_field_id(FIELD_NAME)
+    assert name_node and name_node.grammar_name == NodeKind.IDENTIFIER
+    assert name_node.text
+    enum_name = decode_intern(name_node.text)
+    declaration_list_node = node.child_by_field_id(FIELD_BODY)
+    assert (
+        not declaration_list_node
+        or declaration_list_node.grammar_name == NodeKind.ENUM_DECLARATION_LIST
+    )
+
+    found_type = namespace.types_by_id.get(enum_name)
+    if found_type is None:
         code_enum = CodeEnum(enum_name, namespace)
         if declaration_list_node:
             parse_enum_declaration_list(code_enum, declaration_list_node)
-        # print(f"Found enum {enum_name} in namespace {namespace.get_full_path()}")
+        logger.debug(
+            "Found enum %s in namespace %s", enum_name, namespace.get_full_path()
+        )
     else:
-        found_type = namespace.types_by_id[enum_name]
         assert isinstance(found_type, CodeEnum)
         code_enum = found_type
     return code_enum
@@ -684,15 +947,17 @@ def get_generic_type_from_node(
     namespaces: list[CodeNamespace],
     parent_scope: CodeTypeScope,
 ) -> CodeType:
-    generic_type_name_node = type_node.named_children[0]
-    assert generic_type_name_node.grammar_name == NodeKind.IDENTIFIER.value
+    generic_type_name_node = type_node.named_child(0)
+    assert generic_type_name_node
+    assert generic_type_name_node.grammar_name == NodeKind.IDENTIFIER
     assert generic_type_name_node.text
-    generic_type_name = generic_type_name_node.text.decode()
+    generic_type_name = decode_intern(generic_type_name_node.text)
 
-    type_arg_list_node = type_node.named_children[1]
-    assert type_arg_list_node.grammar_name == NodeKind.TYPE_ARG_LIST.value
+    type_arg_list_node = type_node.named_child(1)
+    assert type_arg_list_node
+    assert type_arg_list_node.grammar_name == NodeKind.TYPE_ARG_LIST
     generic_args: list[CodeType] = []
-    for arg_node in type_arg_list_node.named_children:
+    for arg_node in iter_named_children(type_arg_list_node):
         generic_args.append(
             get_type_from_node(codebase, arg_node, namespaces, parent_scope)
         )
@@ -701,7 +966,7 @@ def get_generic_type_from_node(
     generic_type = codebase.resolve_type(generic_type_id, namespaces, parent_scope)
     assert generic_type
     assert isinstance(generic_type, CodeClass)
-    type = CodeClassSpecialized(generic_type, generic_args)
+    type = generic_type.get_specialization(generic_args)
     return type
 
 
@@ -711,8 +976,8 @@ def get_array_type_from_node(
     namespaces: list[CodeNamespace],
     parent_scope: CodeTypeScope,
 ) -> CodeType:
-    assert len(type_node.named_children) == 2
-    element_type_node = type_node.named_children[0]
+    element_type_node = type_node.child_by_field_id(FIELD_TYPE)
+    assert element_type_node
     element_type = get_type_from_node(
         codebase,
         element_type_node,
@@ -720,9 +985,9 @@ def get_array_type_from_node(
         parent_scope,
     )
 
-    array_rank_node = type_node.named_children[1]
-    assert array_rank_node.text
-    assert array_rank_node.text.decode() == "[]", "Unsupported non-1D array"
+    array_rank_node = type_node.child_by_field_id(FIELD_RANK)
+    assert array_rank_node and array_rank_node.text
+    assert array_rank_node.text == b"[]", "Unsupported non-1D array"
 
     generic_type_id = CodeClass.get_id("List", 1)
     generic_type = codebase.resolve_type(
@@ -733,133 +998,154 @@ def get_array_type_from_node(
     assert generic_type
     assert isinstance(generic_type, CodeClass)
 
-    type = CodeClassSpecialized(
-        generic_type,
-        [element_type],
-    )
+    type = generic_type.get_specialization([element_type])
     return type
 
 
-def get_type_from_node(
+def get_named_type_from_node(
     codebase: Codebase,
     type_node: Node,
     namespaces: list[CodeNamespace],
     parent_scope: CodeTypeScope,
 ) -> CodeType:
-    type: CodeType
-    match type_node.grammar_name:
-        case NodeKind.TUPLE_TYPE.value:
-            raise Exception("Tuple types aren't supported")
-
-        case NodeKind.GENERIC_NAME.value:
-            type = get_generic_type_from_node(
-                codebase, type_node, namespaces, parent_scope
-            )
+    assert type_node.text
+    type_id = decode_intern(type_node.text)
+    resolved_type = codebase.resolve_type(type_id, namespaces, parent_scope)
+    if not resolved_type:
+        # TODO: replace with assert after implementing nested class
+        resolved_type = codebase.get_dummy_type(type_id, parent_scope)
+    return resolved_type
 
-        case NodeKind.ARRAY_TYPE.value:
-            type = get_array_type_from_node(
-                codebase, type_node, namespaces, parent_scope
-            )
 
-        case NodeKind.IDENTIFIER.value | NodeKind.PREDEFINED_TYPE.value:
-            assert type_node.text
-            type_id = type_node.text.decode()
-            resolved_type = codebase.resolve_type(type_id, namespaces, parent_scope)
-            if not resolved_type:
-                # TODO: replace with assert after implementing nested class
-                resolved_type = DummyType(type_id, parent_scope)
-            type = resolved_type
-
-        case NodeKind.NULLABLE_TYPE.value:
-            assert type_node.text
-            assert type_node.named_child_count == 1
-            child_node = type_node.named_children[0]
-            base_type = get_type_from_node(
-                codebase, child_node, namespaces, parent_scope
-            )
-            type = CodeNullableType(base_type)
+def get_nullable_type_from_node(
+    codebase: Codebase,
+    type_node: Node,
+    namespaces: list[CodeNamespace],
+    parent_scope: CodeTypeScope,
+) -> CodeType:
+    assert type_node.text
+    assert type_node.named_child_count == 1
+    child_node = type_node.named_child(0)
+    assert child_node
+    base_type = get_type_from_node(codebase, child_node, namespaces, parent_scope)
+    return CodeNullableType(base_type)
 
-    return type
+
+def get_tuple_type_from_node(
+    codebase: Codebase,
+    type_node: Node,
+    namespaces: list[CodeNamespace],
+    parent_scope: CodeTypeScope,
+) -> CodeType:
+    raise Exception("Tuple types aren't supported")
+
+
+TYPE_NODE_PARSERS = index_by_node_kind_ids(
+    {
+        NodeKind.TUPLE_TYPE: get_tuple_type_from_node,
+        NodeKind.GENERIC_NAME: get_generic_type_from_node,
+        NodeKind.ARRAY_TYPE: get_array_type_from_node,
+        NodeKind.IDENTIFIER: get_named_type_from_node,
+        NodeKind.PREDEFINED_TYPE: get_named_type_from_node,
+        NodeKind.NULLABLE_TYPE: get_nullable_type_from_node,
+    }
+)
+
+
+def get_type_from_node(
+    codebase: Codebase,
+    type_node: Node,
+    namespaces: list[CodeNamespace],
+    parent_scope: CodeTypeScope,
+) -> CodeType:
+    type_parser = TYPE_NODE_PARSERS.get(type_node.grammar_id)
+    if not type_parser:
+        raise Exception(f"Unsupported type node {type_node.grammar_name}")
+    return type_parser(codebase, type_node, namespaces, parent_scope)
 
 
 def create_class_field(
-    classlike: CodeClass, node: Node, namespaces: list[CodeNamespace]
+    codebase: Codebase,
+    classlike: CodeClass,
+    node: Node,
+    namespaces: list[CodeNamespace],
 ) -> CodeField:
-    declaration_node = find_node_by_grammar_name(
-        node, NodeKind.VARIABLE_DECLARATION.value
-    )
+    declaration_node = find_child_by_grammar_ids(node, VARIABLE_DECLARATION_IDS)
     assert declaration_node
-    type_node = declaration_node.named_children[0]
-    declarator_node = declaration_node.named_children[1]
+    type_node = declaration_node.child_by_field_id(FIELD_TYPE)
+    assert type_node
+    declarator_node = declaration_node.named_child(1)
+    assert declarator_node
 
     field_type = get_type_from_node(codebase, type_node, namespaces, classlike)
 
-    assert declarator_node.grammar_name == NodeKind.VARIABLE_DECLARATOR.value
-    name_node = declarator_node.named_children[0]
-    assert name_node.grammar_name == NodeKind.IDENTIFIER.value
+    assert declarator_node.grammar_name == NodeKind.VARIABLE_DECLARATOR
+    name_node = declarator_node.child_by_field_id(FIELD_NAME)
+    assert name_node and name_node.grammar_name == NodeKind.IDENTIFIER
 
     assert name_node.text
-    field_name = name_node.text.decode()
+    field_name = decode_intern(name_node.text)
     field = CodeField(field_name, field_type)
     classlike.fields_by_id[field.name] = field
-    # print(f"Added field {classlike.name}.{field.name} of type {field_type.name}")
+    logger.debug(
+        "Added field %s.%s of type %s", classlike.name, field.name, field_type.name
+    )
     return field
 
 
 def create_class_property(
-    parent_class: CodeClass, node: Node, namespaces: list[CodeNamespace]
+    codebase: Codebase,
+    parent_class: CodeClass,
+    node: Node,
+    namespaces: list[CodeNamespace],
 ) -> CodeProperty:
     type_node: Node | None = None
     name_node: Node | None = None
     getter_body: Node | CodeAutoAccessorMethod | None = None
     setter_body: Node | CodeAutoAccessorMethod | None = None
-    for child_node in node.named_children:
+    for child_node in iter_named_children(node):
         match child_node.grammar_name:
-            case NodeKind.TUPLE_TYPE.value:
+            case NodeKind.TUPLE_TYPE:
                 raise Exception("Tuple types aren't supported")
             case (
-                NodeKind.PREDEFINED_TYPE.value
-                | NodeKind.ARRAY_TYPE.value
-                | NodeKind.GENERIC_NAME.value
-                | NodeKind.NULLABLE_TYPE.value
+                NodeKind.PREDEFINED_TYPE
+                | NodeKind.ARRAY_TYPE
+                | NodeKind.GENERIC_NAME
+                | NodeKind.NULLABLE_TYPE
             ):
                 type_node = child_node
-            case NodeKind.IDENTIFIER.value:
+            case NodeKind.IDENTIFIER:
                 if not type_node:
                     # identifier is a custom type
                     type_node = child_node
                 else:
                     name_node = child_node
-            case NodeKind.ARROW_EXPRESSION.value:
+            case NodeKind.ARROW_EXPRESSION:
                 getter_body = child_node
-            case NodeKind.ACCESSOR_LIST.value:
-                for accessor_declaration_node in child_node.named_children:
+            case NodeKind.ACCESSOR_LIST:
+                for accessor_declaration_node in iter_named_children(child_node):
                     assert (
                         accessor_declaration_node.grammar_name
-                        == NodeKind.ACCESSOR_DECLARATION.value
+                        == NodeKind.ACCESSOR_DECLARATION
+                    )
+                    # Auto accessors have no body
+                    accessor_body_node = accessor_declaration_node.child_by_field_id(
+                        FIELD_BODY
                     )
-                    # FIXME: change this code when get/set becomes a named child
-                    if len(accessor_declaration_node.named_children):
-                        for accessor_node in accessor_declaration_node.children:
-                            if accessor_node.grammar_name == "get":
-                                getter_body = find_node_by_grammar_name(
-                                    accessor_declaration_node,
-                                    NodeKind.ARROW_EXPRESSION.value,
-                                ) or find_node_by_grammar_name(
-                                    accessor_declaration_node, NodeKind.BLOCK.value
-                                )
-                            elif accessor_node.grammar_name == "set":
-                                setter_body = find_node_by_grammar_name(
-                                    accessor_declaration_node,
-                                    NodeKind.ARROW_EXPRESSION.value,
-                                ) or find_node_by_grammar_name(
-                                    accessor_declaration_node, NodeKind.BLOCK.value
-                                )
+                    if accessor_body_node:
+                        accessor_keyword_node = (
+                            accessor_declaration_node.child_by_field_id(FIELD_NAME)
+                        )
+                        assert accessor_keyword_node
+                        if accessor_keyword_node.grammar_name == "get":
+                            getter_body = accessor_body_node
+                        elif accessor_keyword_node.grammar_name == "set":
+                            setter_body = accessor_body_node
 
     assert name_node
     assert name_node.text
     assert type_node
-    property_name = name_node.text.decode()
+    property_name = decode_intern(name_node.text)
     property_type = get_type_from_node(codebase, type_node, namespaces, parent_class)
 
     if not getter_body and not setter_body:
@@ -898,7 +1184,13 @@ def create_class_property(
     return property
 
 
+PARAM_TYPE_NODE_KINDS = frozenset(
+    [NodeKind.PREDEFINED_TYPE, NodeKind.ARRAY_TYPE, NodeKind.GENERIC_NAME]
+)
+
+
 def create_class_method(
+    codebase: Codebase,
     parent_class: CodeClass,
     node: Node,
     namespaces: list[CodeNamespace],
@@ -908,65 +1200,62 @@ def create_class_method(
     name_node: Node | None = None
     generic_param_names: list[str] = []
     virtual_kind = CodeVirtualKind.NONE
-    for child_node in node.named_children:
+    for child_node in iter_named_children(node):
         match child_node.grammar_name:
-            case NodeKind.TUPLE_TYPE.value:
+            case NodeKind.TUPLE_TYPE:
                 raise Exception("Tuple types aren't supported")
-            case NodeKind.MODIFIER.value:
+            case NodeKind.MODIFIER:
                 if child_node.text == b"virtual":
                     virtual_kind = CodeVirtualKind.VIRTUAL
                 elif child_node.text == b"override":
                     virtual_kind = CodeVirtualKind.OVERRIDE
             case (
-                NodeKind.PREDEFINED_TYPE.value
-                | NodeKind.ARRAY_TYPE.value
-                | NodeKind.GENERIC_NAME.value
-                | NodeKind.NULLABLE_TYPE.value
+                NodeKind.PREDEFINED_TYPE
+                | NodeKind.ARRAY_TYPE
+                | NodeKind.GENERIC_NAME
+                | NodeKind.NULLABLE_TYPE
             ):
                 return_type_node = child_node
-            case NodeKind.IDENTIFIER.value:
+            case NodeKind.IDENTIFIER:
                 if not return_type_node:
                     # identifier is a custom type
                     return_type_node = child_node
                 else:
                     name_node = child_node
-            case NodeKind.PARAM_LIST.value:
+            case NodeKind.PARAM_LIST:
                 params_node = child_node
-            case NodeKind.BLOCK.value:
+            case NodeKind.BLOCK:
                 body_node = child_node
-            case NodeKind.TYPE_PARAM_LIST.value:
+            case NodeKind.TYPE_PARAM_LIST:
                 generic_param_names = get_type_parameter_names_from_node(child_node)
 
     assert name_node
     assert return_type_node
     assert params_node
 
-    generic_method_scope = CodeTypeScope(parent_class)
+    generic_method_scope = CodeGenericScope(parent_class)
     for generic_name in generic_param_names:
         CodeGenericParameter(generic_name, generic_method_scope)
 
     assert name_node.text
-    method_name = name_node.text.decode()
+    method_name = decode_intern(name_node.text)
 
     return_type = get_type_from_node(
         codebase, return_type_node, namespaces, generic_method_scope
     )
 
     params: list[CodeParam] = []
-    for param_node in params_node.named_children:
-        assert param_node.grammar_name == NodeKind.PARAM.value
+    for param_node in iter_named_children(params_node):
+        assert param_node.grammar_name == NodeKind.PARAM
         param_type_node: Node | None = None
         param_name_node: Node | None = None
-        for param_child_node in param_node.named_children:
-            if param_child_node.grammar_name == NodeKind.TUPLE_TYPE.value:
+        for param_child_node in iter_named_children(param_node):
+            param_child_grammar_name = param_child_node.grammar_name
+            if param_child_grammar_name == NodeKind.TUPLE_TYPE:
                 raise Exception("Tuple types aren't supported")
-            if param_child_node.grammar_name in [
-                NodeKind.PREDEFINED_TYPE.value,
-                NodeKind.ARRAY_TYPE.value,
-                NodeKind.GENERIC_NAME.value,
-            ]:
+            if param_child_grammar_name in PARAM_TYPE_NODE_KINDS:
                 param_type_node = param_child_node
-            elif param_child_node.grammar_name == NodeKind.IDENTIFIER.value:
+            elif param_child_grammar_name == NodeKind.IDENTIFIER:
                 if not param_type_node:
                     # identifier is a custom type
                     param_type_node = param_child_node
@@ -979,7 +1268,7 @@ def create_class_method(
 
         assert param_name_node
         assert param_name_node.text
-        param_name = param_name_node.text.decode()
+        param_name = decode_intern(param_name_node.text)
         param = CodeParam(param_name, param_type, default_value=None)
         params.append(param)
 
@@ -1000,27 +1289,56 @@ def create_class_method(
     method.virtual_kind = virtual_kind
 
     parent_class.methods_by_id[method.id] = method
-    # print(f"Found method {parent_class.name}::{method.name}()")
+    logger.debug("Found method %s::%s()", parent_class.name, method.name)
     return method
 
 
+def visit_using_directive(
+    node: Node, codebase: Codebase, namespace: CodeNamespace, usings: list[str]
+) -> CodeNamespace:
+    usings.append(get_using_from_node(node))
+    return namespace
+
+
+def visit_file_namespace(
+    node: Node, codebase: Codebase, namespace: CodeNamespace, usings: list[str]
+) -> CodeNamespace:
+    return get_or_create_namespace_from_node(node, codebase)
+
+
+def visit_classlike_declaration(
+    node: Node, codebase: Codebase, namespace: CodeNamespace, usings: list[str]
+) -> CodeNamespace:
+    get_or_create_class_from_node(node, codebase, namespace, usings)
+    return namespace
+
+
+def visit_enum_declaration(
+    node: Node, codebase: Codebase, namespace: CodeNamespace, usings: list[str]
+) -> CodeNamespace:
+    get_or_create_enum_from_node(node, namespace)
+    return namespace
+
+
+TREE_LEVEL_VISITORS = index_by_node_kind_ids(
+    {
+        NodeKind.USING_DIRECTIVE: visit_using_directive,
+        NodeKind.FILE_NAMESPACE: visit_file_namespace,
+        NodeKind.CLASS_DECLARATION: visit_classlike_declaration,
+        NodeKind.IFACE_DECLARATION: visit_classlike_declaration,
+        NodeKind.STRUCT_DECLARATION: visit_classlike_declaration,
+        NodeKind.ENUM_DECLARATION: visit_enum_declaration,
+    }
+)
+
+
 def traverse_tree_level(
     parent_node: Node, codebase: Codebase, namespace: CodeNamespace, usings: list[str]
 ):
-    for child_node in parent_node.named_children:
-        match child_node.grammar_name:
-            case NodeKind.USING_DIRECTIVE.value:
-                usings.append(get_using_from_node(child_node))
-            case NodeKind.FILE_NAMESPACE.value:
-                namespace = get_or_create_namespace_from_node(child_node, codebase)
-            case (
-                NodeKind.CLASS_DECLARATION.value
-                | NodeKind.IFACE_DECLARATION.value
-                | NodeKind.STRUCT_DECLARATION.value
-            ):
-                get_or_create_class_from_node(child_node, namespace, usings)
-            case NodeKind.ENUM_DECLARATION.value:
-                get_or_create_enum_from_node(child_node, namespace)
+    for child_node in iter_named_children(parent_node):
+        visitor = TREE_LEVEL_VISITORS.get(child_node.grammar_id)
+        if visitor:
+            namespace = visitor(child_node, codebase, namespace, usings)
 
 
 def gather_namespaces_and_types(trees_by_path: dict[str, Tree], codebase: Codebase):
@@ -1030,145 +1348,162 @@ def gather_namespaces_and_types(trees_by_path: dict[str, Tree], codebase: Codeba
         traverse_tree_level(tree.root_node, codebase, namespace, [])
 
 
-def gather_class_elements(codebase: Codebase):
-    classlikes = [t for t in codebase.get_all_types() if isinstance(t, CodeClass)]
-    print(f"Got {len(classlikes)} class-likes")
-    for classlike in classlikes:
-        for context in classlike.contexts:
+def compute_search_namespaces(
+    parent_namespace: CodeNamespace,
+    using_namespaces: list[CodeNamespace],
+    codebase: Codebase,
+) -> list[CodeNamespace]:
+    namespaces: list[CodeNamespace] = []
 
-            namespaces: list[CodeNamespace] = []
+    # Use parent namespace and all of its direct parents
+    ns: CodeNamespace | None = parent_namespace
+    while ns and ns != codebase.global_namespace:
+        namespaces.append(ns)
+        assert ns.parent is None or isinstance(ns.parent, CodeNamespace)
+        ns = ns.parent
 
-            # Use parent namespace and all of its direct parents
-            ns: CodeNamespace | None = context.parent_namespace
-            while ns and ns != codebase.global_namespace:
-                namespaces.append(ns)
-                assert ns.parent is None or isinstance(ns.parent, CodeNamespace)
-                ns = ns.parent
+    # After that's exhausted, use specific namespaces from `using`s
+    namespaces += using_namespaces
+    namespaces += [codebase.global_namespace]
+    return namespaces
 
-            # After that's exhausted, use specific namespaces from `using`s
-            namespaces += [codebase.get_namespace(ns) for ns in context.using_strs]
-            namespaces += [codebase.global_namespace]
+
+CLASS_ELEMENT_CREATORS = index_by_node_kind_ids(
+    {
+        NodeKind.FIELD_DECLARATION: create_class_field,
+        NodeKind.METHOD_DECLARATION: create_class_method,
+        NodeKind.PROPERTY_DECLARATION: create_class_property,
+    }
+)
+
+
+def gather_class_elements(codebase: Codebase):
+    print(f"Got {len(codebase.classlikes)} class-likes")
+    for classlike in codebase.classlikes:
+        seen_usings = set(classlike.usings)
+        for context in classlike.contexts:
+            namespaces = context.get_search_namespaces(codebase)
+
+            for using_namespace in context.get_using_namespaces(codebase):
+                if using_namespace not in seen_usings:
+                    seen_usings.add(using_namespace)
+                    classlike.usings.append(using_namespace)
 
             classlike.add_base_nodes(context.base_nodes, codebase, namespaces)
 
-            for declaration_node in context.declaration_list_node.named_children:
-                match declaration_node.grammar_name:
-                    case NodeKind.FIELD_DECLARATION.value:
-                        create_class_field(classlike, declaration_node, namespaces)
-                    case NodeKind.METHOD_DECLARATION.value:
-                        create_class_method(classlike, declaration_node, namespaces)
-                    case NodeKind.PROPERTY_DECLARATION.value:
-                        create_class_property(classlike, declaration_node, namespaces)
+            for declaration_node in iter_named_children(context.declaration_list_node):
+                creator = CLASS_ELEMENT_CREATORS.get(declaration_node.grammar_id)
+                if creator:
+                    creator(codebase, classlike, declaration_node, namespaces)
 
         if classlike.kind == CodeClassKind.INTERFACE:
             for method in classlike.methods_by_id.values():
                 method.virtual_kind = CodeVirtualKind.PURE
 
 
-def consolidate_class_usings(codebase: Codebase):
-    classlikes = [t for t in codebase.get_all_types() if isinstance(t, CodeClass)]
-    print(f"Got {len(classlikes)} class-likes")
-    for classlike in classlikes:
-        for context in classlike.contexts:
-            for using in context.using_strs:
-                ns = codebase.get_namespace(using)
-                if ns not in classlike.usings:
-                    classlike.usings.append(ns)
-
-
 def prepare_out_directory(out_path: str):
     if os.path.exists(out_path):
-        old_out_files = glob.glob(f"{out_path}/**/*.cs")
-        for f in old_out_files:
-            os.remove(f)
+        # Unpruned, namespaces like `Bin` are emitted to `bin/`
+        for directory_path, _, file_names in os.walk(out_path):
+            for file_name in file_names:
+                if file_name.endswith(".cs"):
+                    os.remove(os.path.join(directory_path, file_name))
     else:
         os.makedirs(out_path, exist_ok=True)
 
 
+# Stand-ins for framework types referenced by the scripts
+DUMMY_NAMESPACES = [
+    "System.Linq",
+    "System.Collections.Generic",
+    "System.IO",
+    "System.Text.RegularExpressions",
+    "Godot",
+    "GdUnit4.Assertions",
+]
+DUMMY_GENERIC_CLASSES = {
+    "System.Collections.Generic": [
+        ("HashSet", ["TElement"]),
+        ("List", ["TElement"]),
+        ("IReadOnlyList", ["TElement"]),
+        ("IReadOnlyDictionary", ["TKey", "TValue"]),
+        ("Dictionary", ["TKey", "TValue"]),
+    ],
+}
+DUMMY_CLASSES = {
+    "Godot": [
+        "AnimationPlayer",
+        "Area3D",
+        "Button",
+        "ButtonGroup",
+        "Color",
+        "ColorRect",
+        "Control",
+        "GpuParticles3D",
+        "HBoxContainer",
+        "Label",
+        "Marker3D",
+        "MeshInstance3D",
+        "NavigationAgent3D",
+        "Node",
+        "Node3D",
+        "PackedScene",
+        "ProgressBar",
+        "ShaderMaterial",
+        "StaticBody3D",
+        "Texture2D",
+        "Timer",
+        "VBoxContainer",
+        "Vector2",
+        "Vector3",
+    ],
+    "System.Text.RegularExpressions": ["Regex"],
+    "": ["bool", "float", "double", "int", "string", "void"],
+}
+
+
 def populate_with_dummy(codebase: Codebase):
-    def make_dummy_generic(name: str, param_names: list[str], namespace: CodeNamespace):
-        dummy = CodeClass(name, CodeClassKind.CLASS, param_names, namespace)
-        dummy.is_dummy_type = True
-
-    def make_dummy_class(name, namespace):
-        dummy = CodeClass(name, CodeClassKind.CLASS, [], namespace)
-        dummy.is_dummy_type = True
-
-    ns_system = CodeNamespace("System", codebase.global_namespace)
-    ns_system_linq = CodeNamespace("Linq", ns_system)
-    ns_system_collections = CodeNamespace("Collections", ns_system)
-    ns_system_collections_generic = CodeNamespace("Generic", ns_system_collections)
-    ns_system_io = CodeNamespace("IO", ns_system)
-    ns_system_text = CodeNamespace("Text", ns_system)
-    ns_system_text_regularexpressions = CodeNamespace(
-        "RegularExpressions", ns_system_text
-    )
-    ns_godot = CodeNamespace("Godot", codebase.global_namespace)
-    ns_gdunit4 = CodeNamespace("GdUnit4", codebase.global_namespace)
-    ns_gdunit4_assertions = CodeNamespace("Assertions", ns_gdunit4)
-
-    make_dummy_generic("HashSet", ["TElement"], ns_system_collections_generic)
-    make_dummy_generic("List", ["TElement"], ns_system_collections_generic)
-    make_dummy_generic("IReadOnlyList", ["TElement"], ns_system_collections_generic)
-    make_dummy_generic(
-        "IReadOnlyDictionary", ["TKey", "TValue"], ns_system_collections_generic
-    )
-    make_dummy_generic(
-        "Dictionary",
-        ["TKey", "TValue"],
-        ns_system_collections_generic,
+    for namespace_path in DUMMY_NAMESPACES:
+        codebase.get_or_create_namespace(namespace_path)
+
+    for namespace_path, generic_classes in DUMMY_GENERIC_CLASSES.items():
+        namespace = codebase.get_namespace(namespace_path)
+        for name, param_names in generic_classes:
+            CodeClass(
+                name, CodeClassKind.CLASS, param_names, namespace, is_dummy_type=True
+            )
+
+    for namespace_path, class_names in DUMMY_CLASSES.items():
+        namespace = codebase.get_namespace(namespace_path)
+        for name in class_names:
+            CodeClass(name, CodeClassKind.CLASS, [], namespace, is_dummy_type=True)
+
+
+def main():
+    verbose = bool(os.environ.get("GDUNSHARP_VERBOSE"))
+    logging.basicConfig(
+        format="%(levelname)s: %(message)s",
+        level=logging.DEBUG if verbose else logging.WARNING,
     )
 
-    make_dummy_class("AnimationPlayer", ns_godot)
-    make_dummy_class("Area3D", ns_godot)
-    make_dummy_class("Button", ns_godot)
-    make_dummy_class("ButtonGroup", ns_godot)
-    make_dummy_class("Color", ns_godot)
-    make_dummy_class("ColorRect", ns_godot)
-    make_dummy_class("Control", ns_godot)
-    make_dummy_class("GpuParticles3D", ns_godot)
-    make_dummy_class("HBoxContainer", ns_godot)
-    make_dummy_class("Label", ns_godot)
-    make_dummy_class("Marker3D", ns_godot)
-    make_dummy_class("MeshInstance3D", ns_godot)
-    make_dummy_class("NavigationAgent3D", ns_godot)
-    make_dummy_class("Node", ns_godot)
-    make_dummy_class("Node3D", ns_godot)
-    make_dummy_class("PackedScene", ns_godot)
-    make_dummy_class("ProgressBar", ns_godot)
-    make_dummy_class("ShaderMaterial", ns_godot)
-    make_dummy_class("StaticBody3D", ns_godot)
-    make_dummy_class("Texture2D", ns_godot)
-    make_dummy_class("Timer", ns_godot)
-    make_dummy_class("VBoxContainer", ns_godot)
-    make_dummy_class("Vector2", ns_godot)
-    make_dummy_class("Vector3", ns_godot)
-
-    make_dummy_class("Regex", ns_system_text_regularexpressions)
-
-    make_dummy_class("bool", codebase.global_namespace)
-    make_dummy_class("float", codebase.global_namespace)
-    make_dummy_class("double", codebase.global_namespace)
-    make_dummy_class("int", codebase.global_namespace)
-    make_dummy_class("string", codebase.global_namespace)
-    make_dummy_class("void", codebase.global_namespace)
-
-
-print("Parsing C# files...")
-project_dir = "gdfire"
-trees = parse_files(f"test_scripts/{project_dir}")
-out_path = f"out/{project_dir}"
-
-# Step 2: build code database of stuff in file
-print("Gathering namespaces and types...")
-codebase = Codebase()
-populate_with_dummy(codebase)
-gather_namespaces_and_types(trees, codebase)
-gather_class_elements(codebase)
-consolidate_class_usings(codebase)
-
-# Step 3: emit cpp code based on the code database
-prepare_out_directory(out_path)
-codebase.emit_cpp(out_path)
-
-print("All done!")
+    print("Parsing C# files...")
+    project_dir = "gdfire"
+    trees = parse_files(f"test_scripts/{project_dir}")
+    out_path = f"out/{project_dir}"
+
+    # Step 2: build code database of stuff in file
+    print("Gathering namespaces and types...")
+    codebase = Codebase()
+    populate_with_dummy(codebase)
+    gather_namespaces_and_types(trees, codebase)
+    gather_class_elements(codebase)
+
+    # Step 3: emit cpp code based on the code database
+    prepare_out_directory(out_path)
+    codebase.emit_cpp(out_path)
+
+    print("All done!")
+
+
+if __name__ == "__main__":
+    main()